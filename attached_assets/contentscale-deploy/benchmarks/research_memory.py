@@ -0,0 +1,55 @@
+"""
+Memory benchmark for cached research results
+
+Builds N research results and measures the bytes each one holds while cached,
+comparing the JSON-shaped nested dicts (what perform_seo_research used to
+return) with the slotted ResearchResult objects it returns now.
+
+    python benchmarks/research_memory.py [N]
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('KEYWORD_INDEX_PATH', os.path.join(tempfile.mkdtemp(), 'keyword_index.bin'))
+
+from src.routes.seo import perform_seo_research
+
+
+def measure(build, count):
+    """Return bytes allocated per item for `count` items kept alive in a list"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    keywords = [f"benchmark keyword {i}" for i in range(count)]
+
+    with mock.patch('src.routes.seo.time.sleep'):
+        results = [perform_seo_research(keyword) for keyword in keywords]
+
+    # Both representations are built from the same results inside the measured
+    # region. Scalars (keyword strings, numbers, enum members) are shared by
+    # both, so the difference is container overhead and duplicated strings.
+    as_dicts = measure(lambda i: results[i].to_dict(), count)
+    as_objects = measure(lambda i: copy.deepcopy(results[i]), count)
+
+    print(f"Cached research results: {count}")
+    print(f"  nested dicts (before): {as_dicts:,.0f} bytes per keyword")
+    print(f"  slotted objects (after): {as_objects:,.0f} bytes per keyword")
+    print(f"  reduction: {as_dicts / as_objects:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Latency benchmark for keyword autocomplete
+
+Builds a synthetic corpus of N keywords, then times suggest() for 1-3
+character prefixes, first on an idle index and then while save_in_background()
+is rewriting the index file on another thread.
+
+    python benchmarks/suggest_latency.py [N]
+"""
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.keyword_index import KeywordIndex
+
+WORDS = [
+    "seo", "content", "marketing", "keyword", "research", "tools", "guide", "best",
+    "strategy", "local", "blog", "ranking", "google", "audit", "backlinks", "ecommerce",
+    "social", "media", "email", "analytics", "technical", "mobile", "video", "voice"
+]
+
+
+def build_corpus(count, rng):
+    """Two- to four-word keywords grouped by a skewed weight, as a search log would produce"""
+    keywords = set()
+    while len(keywords) < count:
+        words = rng.choices(WORDS, k=rng.randint(1, 3))
+        words.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))))
+        keywords.add(" ".join(words))
+    by_weight = {}
+    for keyword in sorted(keywords):
+        weight = rng.choices([1, 2, 5, 20, 100, 1000], weights=[50, 25, 15, 6, 3, 1])[0]
+        by_weight.setdefault(weight, []).append(keyword)
+    return by_weight
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return f"p50 {pick(0.5):.3f} ms  p99 {pick(0.99):.3f} ms  max {samples[-1] * 1000:.3f} ms"
+
+
+def time_lookups(index, prefixes, keep_going=lambda: True):
+    samples = {length: [] for length in (1, 2, 3)}
+    for prefix in prefixes:
+        if not keep_going():
+            break
+        start = time.perf_counter()
+        index.suggest(prefix, 10)
+        samples[len(prefix)].append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 350000
+    rng = random.Random(0)
+    path = os.path.join(tempfile.mkdtemp(), 'keyword_index.bin')
+
+    index = KeywordIndex(path)
+    for weight, keywords in build_corpus(count, rng).items():
+        index.add_many(keywords, weight)
+    start = time.perf_counter()
+    index.save()
+    print(f"Corpus: {len(index)} keywords, save() took {time.perf_counter() - start:.2f} s")
+
+    alphabet = string.ascii_lowercase
+    prefixes = [
+        "".join(rng.choices(alphabet, k=length)) if rng.random() < 0.5
+        else rng.choice(WORDS)[:length]
+        for length in (1, 2, 3) for _ in range(3000)
+    ]
+    rng.shuffle(prefixes)
+
+    print("Idle index:")
+    for length, samples in time_lookups(index, prefixes).items():
+        print(f"  {length}-char prefix: {percentiles(samples)}")
+
+    # Each save rewrites the whole file; keep one running for the measurement
+    print("During save_in_background():")
+    samples = {1: [], 2: [], 3: []}
+    for _ in range(3):
+        index.add(f"benchmark {rng.random()}")
+        index.save_in_background()
+        for length, values in time_lookups(index, prefixes, lambda: index._saving).items():
+            samples[length].extend(values)
+    for length, values in samples.items():
+        print(f"  {length}-char prefix: {percentiles(values)}")
+
+
+if __name__ == '__main__':
+    main()
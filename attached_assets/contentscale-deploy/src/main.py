@@ -5,6 +5,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from flask import Flask, send_from_directory
 from flask_cors import CORS
+from src.middleware.compression import init_compression
+from src.middleware.json_provider import init_json_provider
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.content import content_bp
@@ -16,6 +18,10 @@ app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 # Enable CORS for all routes
 CORS(app)
 
+# Fast JSON encoding and negotiated gzip/zstd compression for API responses
+init_json_provider(app)
+init_compression(app)
+
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(content_bp, url_prefix='/api/content')
 app.register_blueprint(seo_bp, url_prefix='/api/seo')
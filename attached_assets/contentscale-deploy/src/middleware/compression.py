@@ -0,0 +1,113 @@
+"""
+Response compression
+
+Compresses responses with zstd or gzip, picked from the client's
+Accept-Encoding header. Small bodies, streamed responses and formats that are
+already compressed are sent as-is.
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+MIN_SIZE = 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/csv",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain"
+}
+
+
+def _zstd_compress(data):
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _gzip_compress(data):
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def available_encodings():
+    """Supported encodings in order of preference"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append(("zstd", _zstd_compress))
+    encodings.append(("gzip", _gzip_compress))
+    return encodings
+
+
+def parse_accept_encoding(header):
+    """Map each encoding in an Accept-Encoding header to its q-value"""
+    accepted = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def negotiate_encoding(header):
+    """Return (name, compress_function) for the best accepted encoding, or None"""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name, compress in available_encodings():
+        q = accepted.get(name, wildcard)
+        if q > best_q:
+            best, best_q = (name, compress), q
+    return best
+
+
+def compress_response(response):
+    """after_request hook that compresses eligible responses in place"""
+    response.vary.add("Accept-Encoding")
+
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_SIZE:
+        return response
+
+    name, compress = encoding
+    response.set_data(compress(data))
+    response.headers["Content-Encoding"] = name
+    return response
+
+
+def init_compression(app):
+    """Register response compression on an app"""
+    app.after_request(compress_response)
@@ -0,0 +1,117 @@
+"""
+Compact in-memory representation of SEO research results
+
+Results are held as slotted dataclasses with enum members for trend and
+competition, so a cached or batched result carries no per-instance __dict__
+and no duplicate strings. Content suggestions are rendered from templates on
+demand. to_dict() produces the JSON shape the API has always returned and is
+only called at the response boundary.
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+
+class Trend(str, Enum):
+    UP = "up"
+    DOWN = "down"
+    STABLE = "stable"
+
+
+class Competition(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+# Top-level sections of a research result that `fields=` can select
+RESEARCH_FIELDS = [
+    "primary_keyword",
+    "related_keywords",
+    "content_suggestions",
+    "competitors",
+    "research_date",
+    "total_opportunities"
+]
+
+CONTENT_SUGGESTION_TEMPLATES = (
+    "Ultimate Guide to {}",
+    "10 Best {} Strategies for 2024",
+    "How to Master {}: Step-by-Step Tutorial",
+    "{} vs Alternatives: Complete Comparison",
+    "Common {} Mistakes to Avoid",
+    "{} Case Studies: Real Success Stories",
+    "Future of {}: Trends and Predictions",
+    "{} Tools and Resources Review"
+)
+
+
+@dataclass(slots=True)
+class KeywordMetrics:
+    keyword: str
+    search_volume: int
+    difficulty: int
+    cpc: float
+    trend: Trend
+    competition: Competition
+
+    def to_dict(self):
+        return {
+            "keyword": self.keyword,
+            "search_volume": self.search_volume,
+            "difficulty": self.difficulty,
+            "cpc": self.cpc,
+            "trend": self.trend.value,
+            "competition": self.competition.value
+        }
+
+
+@dataclass(slots=True)
+class Competitor:
+    domain: str
+    ranking_keywords: int
+    organic_traffic: int
+    domain_authority: int
+
+    def __post_init__(self):
+        # The same handful of domains recur across every result
+        self.domain = sys.intern(self.domain)
+
+    def to_dict(self):
+        return {
+            "domain": self.domain,
+            "ranking_keywords": self.ranking_keywords,
+            "organic_traffic": self.organic_traffic,
+            "domain_authority": self.domain_authority
+        }
+
+
+@dataclass(slots=True)
+class ResearchResult:
+    primary_keyword: KeywordMetrics
+    related_keywords: tuple[KeywordMetrics, ...]
+    competitors: tuple[Competitor, ...]
+    researched_at: float
+
+    @property
+    def content_suggestions(self):
+        keyword = self.primary_keyword.keyword
+        return [template.format(keyword) for template in CONTENT_SUGGESTION_TEMPLATES]
+
+    @property
+    def total_opportunities(self):
+        return len(self.related_keywords) + len(CONTENT_SUGGESTION_TEMPLATES)
+
+    def to_dict(self, fields=None):
+        """Serialize to the API response shape, optionally keeping only `fields`"""
+        sections = {
+            "primary_keyword": lambda: self.primary_keyword.to_dict(),
+            "related_keywords": lambda: [k.to_dict() for k in self.related_keywords],
+            "content_suggestions": lambda: self.content_suggestions,
+            "competitors": lambda: [c.to_dict() for c in self.competitors],
+            "research_date": lambda: datetime.fromtimestamp(self.researched_at).isoformat(),
+            "total_opportunities": lambda: self.total_opportunities
+        }
+        return {field: sections[field]() for field in (fields or RESEARCH_FIELDS)}
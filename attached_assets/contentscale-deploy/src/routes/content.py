@@ -1,12 +1,34 @@
 from flask import Blueprint, request, jsonify
 import time
-import random
+import uuid
 from datetime import datetime
+from src.services.content_index import DEFAULT_LIBRARY, DEFAULT_THRESHOLD, get_content_index
+from src.services.seo_analyzer import analyze_batch, analyze_content
 
 content_bp = Blueprint('content', __name__)
 
+def parse_library(data):
+    """Read the content library name, defaulting to the shared library"""
+    library = data.get('library') or DEFAULT_LIBRARY
+    if not isinstance(library, str):
+        raise ValueError("Library must be a string")
+    return library
+
+def parse_threshold(data):
+    """Read a similarity threshold between 0 and 1"""
+    threshold = data.get('threshold', DEFAULT_THRESHOLD)
+    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1:
+        raise ValueError("Threshold must be a number between 0 and 1")
+    return float(threshold)
+
+def parse_content_id(value):
+    """Normalize a content id so ids given as numbers and strings match"""
+    if isinstance(value, bool) or not isinstance(value, (str, int)) or value == '':
+        raise ValueError("Content id must be a non-empty string or integer")
+    return str(value)
+
 # Mock AI content generation (replace with actual AI service)
-def generate_ai_content(topic, content_type="blog"):
+def generate_ai_content(topic, content_type="blog", library=DEFAULT_LIBRARY):
     """
     Generate AI content based on topic and type
     In production, this would connect to OpenAI, Claude, or other AI services
@@ -304,14 +326,22 @@ Ready to level up? The time is NOW.
 *Generated on {datetime.now().strftime('%B %d, %Y')}*
 """
     
-    # Calculate SEO score (mock)
-    seo_score = random.randint(70, 95)
-    word_count = len(content.split())
+    # Score the generated content against its topic
+    analysis = analyze_content(content, topic)
+    
+    # Flag existing content this piece would cannibalise, then index it
+    content_id = uuid.uuid4().hex
+    content_index = get_content_index(library)
+    similar_content = content_index.query(content)
+    content_index.add(content_id, content, {"topic": topic, "content_type": content_type})
     
     return {
+        "id": content_id,
         "content": content,
-        "word_count": word_count,
-        "seo_score": seo_score,
+        "word_count": analysis["word_count"],
+        "seo_score": analysis["seo_score"],
+        "seo_analysis": analysis,
+        "similar_content": similar_content,
         "content_type": content_type,
         "topic": topic,
         "generated_at": datetime.now().isoformat()
@@ -332,13 +362,18 @@ def generate_content():
         if not topic:
             return jsonify({"error": "Topic is required"}), 400
         
+        try:
+            library = parse_library(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
         # Validate content type
         valid_types = ['blog', 'article', 'faq', 'social']
         if content_type.lower() not in valid_types:
             content_type = 'blog'
         
         # Generate content
-        result = generate_ai_content(topic, content_type)
+        result = generate_ai_content(topic, content_type, library)
         
         return jsonify({
             "success": True,
@@ -353,6 +388,162 @@ def generate_content():
             "message": "Failed to generate content"
         }), 500
 
+@content_bp.route('/analyze', methods=['POST'])
+def analyze():
+    """Analyze on-page SEO for one document or a batch of documents"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        if 'documents' in data:
+            documents = data.get('documents')
+            
+            if not isinstance(documents, list) or not documents:
+                return jsonify({"error": "Documents array is required"}), 400
+            
+            if len(documents) > 1000:
+                return jsonify({"error": "Maximum 1000 documents allowed per request"}), 400
+            
+            pairs = []
+            for document in documents:
+                if not isinstance(document, dict) or not isinstance(document.get('content'), str):
+                    return jsonify({"error": "Each document needs a content string"}), 400
+                keyword = document.get('keyword')
+                pairs.append((document['content'], keyword if isinstance(keyword, str) else None))
+            
+            results = analyze_batch(pairs)
+            
+            return jsonify({
+                "success": True,
+                "data": {
+                    "results": results,
+                    "processed_count": len(results)
+                },
+                "message": f"Analyzed {len(results)} documents"
+            })
+        
+        content = data.get('content', '')
+        
+        if not isinstance(content, str) or not content.strip():
+            return jsonify({"error": "Content is required"}), 400
+        
+        keyword = data.get('keyword')
+        result = analyze_content(content, keyword if isinstance(keyword, str) else None)
+        
+        return jsonify({
+            "success": True,
+            "data": result,
+            "message": "Content analyzed successfully"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "Failed to analyze content"
+        }), 500
+
+@content_bp.route('/similar', methods=['POST'])
+def similar_content():
+    """Find near-duplicates of a text or of indexed content"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        content = data.get('content')
+        content_id = data.get('content_id')
+        
+        if not content and content_id is None:
+            return jsonify({"error": "Content or content_id is required"}), 400
+        
+        limit = data.get('limit', 10)
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            return jsonify({"error": "Limit must be a positive integer"}), 400
+        limit = min(limit, 100)
+        
+        try:
+            threshold = parse_threshold(data)
+            content_index = get_content_index(parse_library(data))
+            if content_id is not None:
+                content_id = parse_content_id(content_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        if content_id is not None and content_id not in content_index:
+            return jsonify({"error": "Content not found"}), 404
+        
+        if content_id is not None:
+            results = content_index.query(doc_id=content_id, threshold=threshold, limit=limit)
+        else:
+            results = content_index.query(str(content), threshold=threshold, limit=limit)
+        
+        return jsonify({
+            "success": True,
+            "data": {
+                "results": results,
+                "indexed_count": len(content_index)
+            },
+            "message": f"Found {len(results)} similar items"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "Failed to find similar content"
+        }), 500
+
+@content_bp.route('/dedup', methods=['POST'])
+def dedup_content():
+    """Index a batch of documents and group the whole library into near-duplicate clusters"""
+    try:
+        data = request.get_json() or {}
+        
+        documents = data.get('documents', [])
+        
+        if not isinstance(documents, list):
+            return jsonify({"error": "Documents must be an array"}), 400
+        
+        if len(documents) > 1000:
+            return jsonify({"error": "Maximum 1000 documents allowed per request"}), 400
+        
+        try:
+            threshold = parse_threshold(data)
+            content_index = get_content_index(parse_library(data))
+            ids = []
+            for document in documents:
+                if not isinstance(document, dict) or not isinstance(document.get('content'), str):
+                    raise ValueError("Each document needs an id and a content string")
+                ids.append(parse_content_id(document.get('id')))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        for content_id, document in zip(ids, documents):
+            content_index.add(content_id, document['content'], document.get('metadata'))
+        
+        clusters = content_index.find_duplicates(threshold)
+        
+        return jsonify({
+            "success": True,
+            "data": {
+                "clusters": clusters,
+                "duplicate_count": sum(len(c) - 1 for c in clusters),
+                "indexed_count": len(content_index)
+            },
+            "message": f"Found {len(clusters)} groups of near-duplicate content"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "Failed to deduplicate content"
+        }), 500
+
 @content_bp.route('/history', methods=['GET'])
 def get_content_history():
     """Get content generation history (mock data)"""
@@ -2,9 +2,34 @@ from flask import Blueprint, request, jsonify
 import time
 import random
 from datetime import datetime
+from src.models.research import (
+    RESEARCH_FIELDS, Competition, Competitor, KeywordMetrics, ResearchResult, Trend
+)
+from src.services.keyword_index import get_keyword_index
 
 seo_bp = Blueprint('seo', __name__)
 
+TRENDS = list(Trend)
+COMPETITION_LEVELS = list(Competition)
+
+def parse_fields(data):
+    """
+    Read the requested result sections from `?fields=` or a `fields` body value.
+    Returns None when every section is wanted.
+    """
+    fields = request.args.get('fields') or data.get('fields')
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    if not isinstance(fields, list):
+        raise ValueError("Fields must be a comma-separated string or an array")
+    fields = [f.strip() for f in fields if isinstance(f, str) and f.strip()]
+    unknown = [f for f in fields if f not in RESEARCH_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(RESEARCH_FIELDS)}")
+    return fields
+
 def perform_seo_research(keyword):
     """
     Perform SEO keyword research
@@ -19,19 +44,10 @@ def perform_seo_research(keyword):
     difficulty = random.randint(20, 90)
     cpc = round(random.uniform(0.50, 15.00), 2)
     
-    # Generate related keywords
-    related_keywords = [
-        f"{keyword} guide",
-        f"{keyword} tips",
-        f"best {keyword}",
-        f"{keyword} strategy",
-        f"{keyword} tools",
-        f"{keyword} benefits",
-        f"how to {keyword}",
-        f"{keyword} examples",
-        f"{keyword} trends",
-        f"{keyword} analysis"
-    ]
+    # Expand related keywords from the local keyword corpus
+    keyword_index = get_keyword_index()
+    related_keywords = keyword_index.expand(keyword, limit=10)
+    keyword_index.record(keyword)
     
     # Generate keyword variations with mock data
     keyword_data = []
@@ -40,67 +56,54 @@ def perform_seo_research(keyword):
         if volume < 0:
             volume = random.randint(50, 1000)
             
-        keyword_data.append({
-            "keyword": related,
-            "search_volume": volume,
-            "difficulty": random.randint(15, 85),
-            "cpc": round(random.uniform(0.30, 12.00), 2),
-            "trend": random.choice(["up", "down", "stable"]),
-            "competition": random.choice(["low", "medium", "high"])
-        })
+        keyword_data.append(KeywordMetrics(
+            keyword=related,
+            search_volume=volume,
+            difficulty=random.randint(15, 85),
+            cpc=round(random.uniform(0.30, 12.00), 2),
+            trend=random.choice(TRENDS),
+            competition=random.choice(COMPETITION_LEVELS)
+        ))
     
     # Sort by search volume
-    keyword_data.sort(key=lambda x: x["search_volume"], reverse=True)
-    
-    # Generate content suggestions
-    content_suggestions = [
-        f"Ultimate Guide to {keyword}",
-        f"10 Best {keyword} Strategies for 2024",
-        f"How to Master {keyword}: Step-by-Step Tutorial",
-        f"{keyword} vs Alternatives: Complete Comparison",
-        f"Common {keyword} Mistakes to Avoid",
-        f"{keyword} Case Studies: Real Success Stories",
-        f"Future of {keyword}: Trends and Predictions",
-        f"{keyword} Tools and Resources Review"
-    ]
+    keyword_data.sort(key=lambda x: x.search_volume, reverse=True)
     
     # Generate competitor analysis
-    competitors = [
-        {
-            "domain": "example-competitor1.com",
-            "ranking_keywords": random.randint(150, 2500),
-            "organic_traffic": random.randint(5000, 50000),
-            "domain_authority": random.randint(40, 85)
-        },
-        {
-            "domain": "example-competitor2.com",
-            "ranking_keywords": random.randint(200, 3000),
-            "organic_traffic": random.randint(8000, 60000),
-            "domain_authority": random.randint(45, 90)
-        },
-        {
-            "domain": "example-competitor3.com",
-            "ranking_keywords": random.randint(100, 2000),
-            "organic_traffic": random.randint(3000, 40000),
-            "domain_authority": random.randint(35, 80)
-        }
-    ]
+    competitors = (
+        Competitor(
+            domain="example-competitor1.com",
+            ranking_keywords=random.randint(150, 2500),
+            organic_traffic=random.randint(5000, 50000),
+            domain_authority=random.randint(40, 85)
+        ),
+        Competitor(
+            domain="example-competitor2.com",
+            ranking_keywords=random.randint(200, 3000),
+            organic_traffic=random.randint(8000, 60000),
+            domain_authority=random.randint(45, 90)
+        ),
+        Competitor(
+            domain="example-competitor3.com",
+            ranking_keywords=random.randint(100, 2000),
+            organic_traffic=random.randint(3000, 40000),
+            domain_authority=random.randint(35, 80)
+        )
+    )
     
-    return {
-        "primary_keyword": {
-            "keyword": keyword,
-            "search_volume": base_volume,
-            "difficulty": difficulty,
-            "cpc": cpc,
-            "competition": random.choice(["low", "medium", "high"]),
-            "trend": random.choice(["up", "down", "stable"])
-        },
-        "related_keywords": keyword_data,
-        "content_suggestions": content_suggestions,
-        "competitors": competitors,
-        "research_date": datetime.now().isoformat(),
-        "total_opportunities": len(keyword_data) + len(content_suggestions)
-    }
+    # Content suggestions are rendered from templates when the result is serialized
+    return ResearchResult(
+        primary_keyword=KeywordMetrics(
+            keyword=keyword,
+            search_volume=base_volume,
+            difficulty=difficulty,
+            cpc=cpc,
+            trend=random.choice(TRENDS),
+            competition=random.choice(COMPETITION_LEVELS)
+        ),
+        related_keywords=tuple(keyword_data),
+        competitors=competitors,
+        researched_at=time.time()
+    )
 
 @seo_bp.route('/research', methods=['POST'])
 def seo_research():
@@ -119,8 +122,13 @@ def seo_research():
         if len(keyword) < 2:
             return jsonify({"error": "Keyword must be at least 2 characters long"}), 400
         
+        try:
+            fields = parse_fields(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
         # Perform SEO research
-        result = perform_seo_research(keyword)
+        result = perform_seo_research(keyword).to_dict(fields)
         
         return jsonify({
             "success": True,
@@ -152,12 +160,17 @@ def bulk_seo_research():
         if len(keywords) > 100:
             return jsonify({"error": "Maximum 100 keywords allowed per request"}), 400
         
+        try:
+            fields = parse_fields(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
         results = []
         
         for keyword in keywords:
             if isinstance(keyword, str) and keyword.strip():
                 research_result = perform_seo_research(keyword.strip())
-                results.append(research_result)
+                results.append(research_result.to_dict(fields))
         
         return jsonify({
             "success": True,
@@ -176,6 +189,68 @@ def bulk_seo_research():
             "message": "Failed to perform bulk SEO research"
         }), 500
 
+@seo_bp.route('/suggest', methods=['GET'])
+def suggest_keywords():
+    """Autocomplete keywords from the local keyword corpus"""
+    try:
+        query = request.args.get('q', '')
+        limit = max(1, min(request.args.get('limit', 10, type=int) or 10, 50))
+        
+        suggestions = get_keyword_index().suggest(query, limit) if query.strip() else []
+        
+        return jsonify({
+            "success": True,
+            "data": {
+                "query": query,
+                "suggestions": suggestions
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "Failed to retrieve keyword suggestions"
+        }), 500
+
+@seo_bp.route('/suggest/import', methods=['POST'])
+def import_keywords():
+    """Import a keyword word list into the autocomplete corpus"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        keywords = data.get('keywords', [])
+        
+        if not keywords or not isinstance(keywords, list):
+            return jsonify({"error": "Keywords array is required"}), 400
+        
+        if len(keywords) > 10000:
+            return jsonify({"error": "Maximum 10000 keywords allowed per request"}), 400
+        
+        keywords = [k for k in keywords if isinstance(k, str) and k.strip()]
+        keyword_index = get_keyword_index()
+        keyword_index.add_many(keywords)
+        keyword_index.save_in_background()
+        
+        return jsonify({
+            "success": True,
+            "data": {
+                "imported_count": len(keywords),
+                "total_keywords": len(keyword_index)
+            },
+            "message": f"Imported {len(keywords)} keywords"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "Failed to import keywords"
+        }), 500
+
 @seo_bp.route('/export', methods=['POST'])
 def export_seo_data():
     """Export SEO research data as CSV"""
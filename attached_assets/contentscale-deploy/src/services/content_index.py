@@ -0,0 +1,273 @@
+"""
+Near-duplicate content index
+
+Documents are reduced to MinHash signatures over word shingles and stored in
+an LSH table: the signature is cut into bands and each band is hashed into a
+bucket. Near-duplicates share at least one bucket with high probability, so a
+lookup only verifies the handful of documents in its buckets instead of
+comparing against the whole library.
+
+Shingles that appear in a large share of a library are template text (the
+intro, headings and calls to action every generated piece shares), not
+topic, and on their own put two unrelated pieces of one content type at
+0.7-0.8 similarity. Once a library holds BOILERPLATE_MIN_DOCS documents,
+shingles found in more than BOILERPLATE_SHARE of them are left out of the
+signatures. The boilerplate set is recomputed, and every document re-signed,
+each time the library doubles, so updates stay amortized O(1).
+
+With template text removed, the default threshold is 0.8. With 128
+permutations split into 32 bands of 4 rows, a pair becomes a candidate with
+probability 1 - (1 - J^4)^32: about 0.99 at J = 0.6 and above.
+
+Documents without any shingles (empty or punctuation-only text) are not
+indexed and never match, since their signatures carry no information.
+
+The index lives in process memory and is rebuilt from scratch on restart.
+"""
+
+import threading
+import zlib
+
+import numpy as np
+
+from src.services.seo_analyzer import WORD_PATTERN
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_LIBRARY = "default"
+
+# Shingles in more than this share of a library's documents are boilerplate,
+# once the library is large enough for the share to mean anything
+BOILERPLATE_SHARE = 0.1
+BOILERPLATE_MIN_DOCS = 50
+
+# Multiply-shift hash family: h(x) = ((a * x + b) mod 2^64) >> 32, with odd a
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Hash overlapping word n-grams of a text to 32-bit integers"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    return np.unique(hashes)
+
+
+def _signature(values):
+    if len(values) == 0:
+        return None
+    # (NUM_PERM, n) hash matrix; uint64 arithmetic wraps mod 2^64
+    hashed = (_A[:, None] * values[None, :] + _B[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def minhash(text):
+    """Return the MinHash signature (NUM_PERM uint32 values) of a text, or None if it has no shingles"""
+    return _signature(shingles(text))
+
+
+def _topical(values, boilerplate):
+    """Drop boilerplate shingles; a text made only of boilerplate keeps all of them"""
+    if len(boilerplate) == 0:
+        return values
+    kept = values[~np.isin(values, boilerplate, assume_unique=True)]
+    return kept if len(kept) else values
+
+
+def _band_keys(signature):
+    return [signature[i * ROWS:(i + 1) * ROWS].tobytes() for i in range(BANDS)]
+
+
+class ContentIndex:
+    """Incrementally updated MinHash/LSH index over one content library"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shingles = {}
+        self._signatures = {}
+        self._metadata = {}
+        self._buckets = [{} for _ in range(BANDS)]
+        self._boilerplate = np.zeros(0, dtype=np.uint64)
+        self._next_refresh = BOILERPLATE_MIN_DOCS
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._signatures
+
+    def add(self, doc_id, text, metadata=None):
+        """
+        Index a document, replacing any previous version with the same id.
+        Returns the signature, or None when the text has no shingles and is not indexed.
+        """
+        values = shingles(text)
+        with self._lock:
+            if doc_id in self._signatures:
+                self._remove(doc_id)
+            if len(values) == 0:
+                return None
+            self._shingles[doc_id] = values
+            self._metadata[doc_id] = metadata or {}
+            self._insert(doc_id, _signature(_topical(values, self._boilerplate)))
+            if len(self._signatures) >= self._next_refresh:
+                self._refresh_boilerplate()
+            return self._signatures[doc_id]
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _insert(self, doc_id, signature):
+        self._signatures[doc_id] = signature
+        for band, key in enumerate(_band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(doc_id)
+
+    def _remove(self, doc_id):
+        signature = self._signatures.pop(doc_id, None)
+        self._shingles.pop(doc_id, None)
+        self._metadata.pop(doc_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(_band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def _refresh_boilerplate(self):
+        """Recompute the boilerplate shingles and re-sign every document if they changed"""
+        self._next_refresh = 2 * len(self._signatures)
+        ids = list(self._shingles)
+        hashes, counts = np.unique(np.concatenate([self._shingles[i] for i in ids]), return_counts=True)
+        boilerplate = hashes[counts > BOILERPLATE_SHARE * len(ids)]
+        if np.array_equal(boilerplate, self._boilerplate):
+            return
+        self._boilerplate = boilerplate
+        self._signatures = {}
+        self._buckets = [{} for _ in range(BANDS)]
+        for doc_id in ids:
+            self._insert(doc_id, _signature(_topical(self._shingles[doc_id], boilerplate)))
+
+    def _candidates(self, signature):
+        candidates = set()
+        for band, key in enumerate(_band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        return candidates
+
+    def query(self, text=None, doc_id=None, threshold=DEFAULT_THRESHOLD, limit=10):
+        """
+        Find documents similar to `text`, or to an indexed document by `doc_id`.
+
+        Returns a list of {"id", "similarity", "metadata"} dicts, most similar first.
+        """
+        values = shingles(text or "") if doc_id is None else None
+        if values is not None and len(values) == 0:
+            return []
+
+        with self._lock:
+            if doc_id is not None:
+                signature = self._signatures.get(doc_id)
+                if signature is None:
+                    raise KeyError(doc_id)
+            else:
+                signature = _signature(_topical(values, self._boilerplate))
+            candidates = self._candidates(signature)
+            candidates.discard(doc_id)
+            ids = list(candidates)
+            if not ids:
+                return []
+            matrix = np.stack([self._signatures[i] for i in ids])
+            metadata = [self._metadata[i] for i in ids]
+
+        scores = np.count_nonzero(matrix == signature, axis=1) / NUM_PERM
+        order = np.argsort(-scores, kind="stable")
+        results = []
+        for i in order:
+            if scores[i] < threshold or len(results) >= limit:
+                break
+            results.append({"id": ids[i], "similarity": round(float(scores[i]), 3), "metadata": metadata[i]})
+        return results
+
+    def find_duplicates(self, threshold=DEFAULT_THRESHOLD):
+        """
+        Group the whole library into clusters of near-duplicates.
+
+        Only pairs that share an LSH bucket are compared, and verified pairs
+        are merged with union-find. Pairs already in the same cluster are
+        skipped, and a pair rejected in one band is not verified again in
+        another, so a bucket of templated near-copies collapses after a few
+        comparisons instead of being checked all-pairs. Returns a list of
+        clusters, each a list of document ids, largest first; singletons are
+        omitted.
+        """
+        with self._lock:
+            ids = list(self._signatures)
+            matrix = np.stack([self._signatures[i] for i in ids]) if ids else None
+            positions = {doc_id: n for n, doc_id in enumerate(ids)}
+            buckets = [
+                np.array([positions[i] for i in bucket], dtype=np.int64)
+                for table in self._buckets for bucket in table.values() if len(bucket) > 1
+            ]
+
+        parent = np.arange(len(ids))
+
+        def find(x):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        rejected = set()
+        for bucket in buckets:
+            roots = np.array([find(x) for x in bucket])
+            for i in range(len(bucket) - 1):
+                if (roots == roots[0]).all():
+                    break
+                a = bucket[i]
+                root = roots[i]
+                others = np.nonzero(roots[i + 1:] != root)[0] + i + 1
+                others = [j for j in others if (a, bucket[j]) not in rejected]
+                if not others:
+                    continue
+                scores = np.count_nonzero(matrix[bucket[others]] == matrix[a], axis=1) / NUM_PERM
+                for j, score in zip(others, scores):
+                    b = bucket[j]
+                    if score < threshold:
+                        rejected.add((a, b))
+                        rejected.add((b, a))
+                        continue
+                    other_root = find(b)
+                    if other_root == root:
+                        continue
+                    parent[other_root] = root
+                    roots[roots == other_root] = root
+
+        clusters = {}
+        for n in range(len(ids)):
+            clusters.setdefault(find(n), []).append(ids[n])
+        return sorted((c for c in clusters.values() if len(c) > 1), key=len, reverse=True)
+
+
+_libraries = {}
+_libraries_lock = threading.Lock()
+
+
+def get_content_index(library=DEFAULT_LIBRARY):
+    """Return the index for a content library (e.g. one per customer), creating it on first use"""
+    index = _libraries.get(library)
+    if index is None:
+        with _libraries_lock:
+            index = _libraries.setdefault(library, ContentIndex())
+    return index
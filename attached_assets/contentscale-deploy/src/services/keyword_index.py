@@ -0,0 +1,475 @@
+"""
+Keyword expansion and autocomplete index
+
+Keywords are kept as a sorted array of UTF-8 strings, which behaves like a
+compact trie: every prefix maps to one contiguous range that is found with a
+binary search. The array is persisted as a single file and memory-mapped on
+load, so startup cost does not grow with the size of the corpus.
+
+Prefixes with more than MAX_SCAN completions (short ones like "s" or "se")
+are too wide to rank on every keystroke, so save() stores their TOP_K
+heaviest completions in the file. A lookup either reads that list or scans a
+range small enough to rank exactly.
+
+File layout (little endian):
+    magic b"CSKI" | version u32 | count u32 | top_count u32
+    offsets u32[count + 1]          (byte offsets into the keyword blob)
+    weights u32[count]              (how often a keyword has been seen)
+    top_offsets u32[top_count + 1]  (byte offsets into the prefix blob)
+    top u32[top_count * TOP_K]      (keyword numbers per prefix, padded with 0xFFFFFFFF)
+    blob                            (sorted keywords, UTF-8, no separators)
+    prefix blob                     (sorted wide prefixes, UTF-8, no separators)
+
+Version 1 files (no top_count and no top table) are still read; their wide
+prefixes fall back to a bounded scan until the next save.
+"""
+
+import atexit
+import heapq
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+
+MAGIC = b"CSKI"
+VERSION = 2
+HEADER = struct.Struct("<4sII")
+TOP_HEADER = struct.Struct("<I")
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'database', 'keyword_index.bin'
+)
+
+# Modifier patterns used to expand a seed keyword. "{}" is the seed.
+MODIFIER_PATTERNS = [
+    "{} guide",
+    "{} tips",
+    "best {}",
+    "{} strategy",
+    "{} tools",
+    "{} benefits",
+    "how to {}",
+    "{} examples",
+    "{} trends",
+    "{} analysis"
+]
+
+# Prefixes with at most this many completions are scanned and ranked on lookup;
+# wider ones get a precomputed top list on save()
+MAX_SCAN = 256
+
+# Completions stored per wide prefix; the /suggest endpoint caps limit at this
+TOP_K = 50
+NO_KEY = 0xFFFFFFFF
+
+# Pending keywords are flushed to disk in the background once this many have accumulated
+SAVE_EVERY = 64
+
+# A background save briefly releases the GIL every this many keywords so
+# concurrent lookups are not held up for a whole switch interval
+YIELD_EVERY = 1024
+
+_whitespace = re.compile(r"\s+")
+
+
+def normalize_keyword(keyword):
+    """Lowercase and collapse whitespace so lookups are case-insensitive"""
+    return _whitespace.sub(" ", keyword).strip().lower()
+
+
+def _u32_array(buffer, start, end):
+    """Zero-copy view of a u32 section on little-endian hosts, a swapped copy elsewhere"""
+    if sys.byteorder == "little":
+        return memoryview(buffer)[start:end].cast("I")
+    values = array("I")
+    values.frombytes(buffer[start:end])
+    values.byteswap()
+    return values
+
+
+def _u32_bytes(values):
+    if sys.byteorder != "little":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _prefix_end(prefix):
+    """Smallest byte string greater than every string starting with prefix"""
+    return prefix[:-1] + bytes([prefix[-1] + 1]) if prefix[-1] < 0xFF else None
+
+
+def _top_completions(keys, weights):
+    """
+    Find every prefix with more than MAX_SCAN completions in a sorted key list.
+    Returns sorted (prefix, [key numbers]) pairs, heaviest completions first.
+    """
+    table = []
+    # Each range shares its first `depth` bytes; split it by the next byte
+    ranges = [(0, len(keys), 0)]
+    while ranges:
+        lo, hi, depth = ranges.pop()
+        i = lo
+        while i < hi:
+            if len(keys[i]) <= depth:
+                i += 1
+                continue
+            prefix = keys[i][:depth + 1]
+            end = _prefix_end(prefix)
+            j = bisect_left(keys, end, i, hi) if end is not None else hi
+            if j - i > MAX_SCAN:
+                # Ties keep key order, matching suggest()
+                table.append((prefix, heapq.nlargest(TOP_K, range(i, j), key=weights.__getitem__)))
+                ranges.append((i, j, depth + 1))
+                time.sleep(0)
+            i = j
+    table.sort()
+    return table
+
+
+class _Segment:
+    """Read-only view over one memory-mapped index file"""
+
+    def __init__(self, path=None):
+        self.count = 0
+        self.offsets = array("I", [0])
+        self.weights = array("I")
+        self.blob_start = 0
+        self.top_count = 0
+        self.top_offsets = array("I", [0])
+        self.top = array("I")
+        self.prefix_start = 0
+        self._mmap = None
+
+        if path is None or not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            return
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"Unsupported keyword index file: {path}")
+
+        position = HEADER.size
+        top_count = 0
+        if version >= 2:
+            top_count, = TOP_HEADER.unpack_from(self._mmap, position)
+            position += TOP_HEADER.size
+
+        offsets_end = position + 4 * (count + 1)
+        weights_end = offsets_end + 4 * count
+        top_offsets_end = weights_end + (4 * (top_count + 1) if version >= 2 else 0)
+        top_end = top_offsets_end + 4 * top_count * TOP_K
+        self.offsets = _u32_array(self._mmap, position, offsets_end)
+        self.weights = _u32_array(self._mmap, offsets_end, weights_end)
+        if version >= 2:
+            self.top_offsets = _u32_array(self._mmap, weights_end, top_offsets_end)
+            self.top = _u32_array(self._mmap, top_offsets_end, top_end)
+        self.blob_start = top_end
+        self.prefix_start = top_end + self.offsets[count]
+        self.top_count = top_count
+        self.count = count
+
+    def key(self, i):
+        return self._mmap[self.blob_start + self.offsets[i]:self.blob_start + self.offsets[i + 1]]
+
+    def lower_bound(self, prefix):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def weight(self, key):
+        i = self.lower_bound(key)
+        return self.weights[i] if i < self.count and self.key(i) == key else 0
+
+    def _prefix(self, i):
+        return self._mmap[self.prefix_start + self.top_offsets[i]:self.prefix_start + self.top_offsets[i + 1]]
+
+    def top_completions(self, prefix):
+        """Return the stored (key, weight) list for a wide prefix, or None if the prefix is not stored"""
+        lo, hi = 0, self.top_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.top_count or self._prefix(lo) != prefix:
+            return None
+        numbers = self.top[lo * TOP_K:(lo + 1) * TOP_K]
+        return [(self.key(i), self.weights[i]) for i in numbers if i != NO_KEY]
+
+
+def _merged(segment, pending):
+    """Yield (key, weight) in key order over a segment and a sorted list of pending (key, weight) pairs"""
+    i = 0
+    for key, weight in pending:
+        while i < segment.count:
+            existing = segment.key(i)
+            if existing > key:
+                break
+            i += 1
+            if existing == key:
+                weight += segment.weights[i - 1]
+                break
+            yield existing, segment.weights[i - 1]
+        yield key, weight
+    while i < segment.count:
+        yield segment.key(i), segment.weights[i]
+        i += 1
+
+
+class KeywordIndex:
+    """
+    Prefix index over a keyword corpus.
+
+    The bulk of the corpus lives in the memory-mapped file. Keywords added at
+    runtime go into a small in-memory sorted list and are merged into the file
+    on save(), which also refreshes the stored top lists. The file is rebuilt
+    without holding the lock that add() and lookups use; pending keywords stay
+    visible until the new file is mapped.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._saving = False
+        self._segment = _Segment(path)
+        self._pending = []
+        self._pending_weights = {}
+
+    def __len__(self):
+        return self._segment.count + len(self._pending)
+
+    def save(self):
+        """Merge pending keywords into the index file and remap it"""
+        with self._save_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                segment = self._segment
+                flushed = dict(self._pending_weights)
+                pending = [(key, flushed[key]) for key in self._pending]
+
+            # Both sides are already sorted, so one merge pass builds the new key order
+            keys = []
+            weights = array("I")
+            offsets = array("I", [0])
+            blob = bytearray()
+            for key, weight in _merged(segment, pending):
+                keys.append(key)
+                weights.append(min(weight, 0xFFFFFFFF))
+                blob += key
+                offsets.append(len(blob))
+                if len(keys) % YIELD_EVERY == 0:
+                    time.sleep(0)
+
+            top = _top_completions(keys, weights)
+            top_offsets = array("I", [0])
+            top_numbers = array("I")
+            prefix_blob = bytearray()
+            for prefix, numbers in top:
+                prefix_blob += prefix
+                top_offsets.append(len(prefix_blob))
+                top_numbers.extend(numbers)
+                top_numbers.extend([NO_KEY] * (TOP_K - len(numbers)))
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(keys)))
+                f.write(TOP_HEADER.pack(len(top)))
+                f.write(_u32_bytes(offsets))
+                f.write(_u32_bytes(weights))
+                f.write(_u32_bytes(top_offsets))
+                f.write(_u32_bytes(top_numbers))
+                f.write(blob)
+                f.write(prefix_blob)
+            os.replace(tmp_path, self.path)
+            new_segment = _Segment(self.path)
+
+            # Keep only what was added while the file was being written. New
+            # objects are assigned so lookups iterating the old ones are unaffected.
+            # Readers holding the old segment keep a valid mapping until they finish.
+            with self._lock:
+                pending_weights = {}
+                for key, weight in self._pending_weights.items():
+                    remaining = weight - flushed.get(key, 0)
+                    if remaining > 0:
+                        pending_weights[key] = remaining
+                self._segment = new_segment
+                self._pending = sorted(pending_weights)
+                self._pending_weights = pending_weights
+
+    def save_in_background(self):
+        """Start a save on a daemon thread unless one is already running"""
+        with self._lock:
+            if self._saving:
+                return
+            self._saving = True
+
+        def run():
+            try:
+                self.save()
+            finally:
+                self._saving = False
+
+        threading.Thread(target=run, name="keyword-index-save", daemon=True).start()
+
+    def add(self, keyword, weight=1):
+        """Add a keyword (or bump its weight) without rewriting the file"""
+        key = normalize_keyword(keyword).encode("utf-8")
+        if not key:
+            return
+        with self._lock:
+            if key not in self._pending_weights:
+                self._pending_weights[key] = 0
+                insort(self._pending, key)
+            self._pending_weights[key] += weight
+
+    def record(self, keyword):
+        """Add a researched keyword and flush to disk periodically, off the request path"""
+        self.add(keyword)
+        if len(self._pending) >= SAVE_EVERY:
+            self.save_in_background()
+
+    def add_many(self, keywords, weight=1):
+        """Add a batch of keywords, sorting the new ones once rather than inserting each"""
+        counts = {}
+        for keyword in keywords:
+            key = normalize_keyword(keyword).encode("utf-8")
+            if key:
+                counts[key] = counts.get(key, 0) + weight
+        if not counts:
+            return
+        with self._lock:
+            new_keys = [key for key in counts if key not in self._pending_weights]
+            for key, count in counts.items():
+                self._pending_weights[key] = self._pending_weights.get(key, 0) + count
+            if new_keys:
+                # Both runs are sorted, which sorted() merges in linear time
+                new_keys.sort()
+                self._pending = sorted(self._pending + new_keys)
+
+    def import_word_list(self, path):
+        """Import a newline-separated word list and persist it. Returns the number of lines imported."""
+        with open(path, encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+        keywords = [line for line in lines if line and not line.startswith("#")]
+        self.add_many(keywords)
+        self.save()
+        return len(keywords)
+
+    def _completions(self, prefix):
+        """
+        Return {key: weight} for the heaviest keys starting with prefix.
+
+        Wide prefixes read their stored top list; narrow ones are scanned in
+        full. Pending keys are few between saves and are all added on top.
+        """
+        segment = self._segment
+        top = segment.top_completions(prefix)
+        if top is not None:
+            weights = dict(top)
+        else:
+            weights = {}
+            i = segment.lower_bound(prefix)
+            end = min(segment.count, i + MAX_SCAN)
+            while i < end:
+                key = segment.key(i)
+                if not key.startswith(prefix):
+                    break
+                weights[key] = segment.weights[i]
+                i += 1
+
+        pending, pending_weights = self._pending, self._pending_weights
+        start = bisect_left(pending, prefix)
+        end = _prefix_end(prefix)
+        for key in pending[start:bisect_left(pending, end, start) if end is not None else len(pending)]:
+            if key not in weights:
+                # Outside the stored top list the key may still have a weight on disk
+                weights[key] = segment.weight(key) if top is not None else 0
+            weights[key] += pending_weights.get(key, 0)
+        return weights
+
+    def suggest(self, prefix, limit=10):
+        """Return up to `limit` completions for a prefix, most frequent first"""
+        normalized = normalize_keyword(prefix)
+        if not normalized:
+            return []
+        # A trailing space means the user finished a word: "seo " should not match "seotools"
+        if prefix[-1:].isspace():
+            normalized += " "
+
+        weights = self._completions(normalized.encode("utf-8"))
+        ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+        return [key.decode("utf-8") for key, _ in ranked[:limit]]
+
+    def contains(self, keyword):
+        key = normalize_keyword(keyword).encode("utf-8")
+        segment = self._segment
+        i = segment.lower_bound(key)
+        if i < segment.count and segment.key(i) == key:
+            return True
+        return key in self._pending_weights
+
+    def expand(self, keyword, limit=10):
+        """
+        Expand a seed keyword into related keywords.
+
+        Corpus entries that extend the seed come first, followed by modifier
+        patterns the corpus already knows about, then the remaining patterns
+        to fill up to `limit`. Pattern candidates keep the caller's casing;
+        the normalized form is only used for lookups.
+        """
+        seed = normalize_keyword(keyword)
+        if not seed:
+            return []
+        display = _whitespace.sub(" ", keyword).strip()
+
+        completions = self.suggest(f"{seed} ", limit)
+        related = [display + completion[len(seed):] for completion in completions]
+
+        known, unknown = [], []
+        for pattern in MODIFIER_PATTERNS:
+            candidate = pattern.format(display)
+            if normalize_keyword(candidate) in completions:
+                continue
+            (known if self.contains(candidate) else unknown).append(candidate)
+
+        return (related + known + unknown)[:limit]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_keyword_index():
+    """Return the process-wide keyword index, loading it on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = KeywordIndex(os.environ.get('KEYWORD_INDEX_PATH', DEFAULT_INDEX_PATH))
+                atexit.register(_index.save)
+    return _index
+
+
+if __name__ == '__main__':
+    # python -m src.services.keyword_index words.txt [more.txt ...]
+    index = get_keyword_index()
+    for word_list in sys.argv[1:]:
+        print(f"Imported {index.import_word_list(word_list)} keywords from {word_list}")
+    print(f"Index now holds {len(index)} keywords at {index.path}")
@@ -0,0 +1,325 @@
+"""
+On-page SEO analyzer
+
+Each document is scanned once, line by line, into flat token arrays (word id,
+syllable count, sentence and paragraph membership). Every heading is its own
+segment with a negative sentence id, so keyword phrases never span a heading
+and the following text, or two sentences. A batch of documents is
+concatenated into one set of arrays tagged with a document id, and all per-
+document statistics are aggregated with NumPy (bincount / vector comparisons)
+instead of Python loops, so scoring thousands of documents is a single pass.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Letters and digits in any script, with inner apostrophes ("don't", "l’été")
+WORD_PATTERN = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+_sentence_end = re.compile(r"[.!?]+(?=\s|$)")
+_heading = re.compile(r"^(#{1,6})\s+(.*)$")
+_list_item = re.compile(r"^\s*(?:[-*+•✓✅→]|\d+[.)])\s+")
+_markdown_link = re.compile(r"\[[^\]]+\]\([^)]+\)")
+_bare_link = re.compile(r"(?<!\()https?://\S+")
+_vowel_groups = re.compile(r"[aeiouyàáâãäåæèéêëìíîïòóôõöøùúûüýÿœ]+")
+
+# Target ranges used when turning raw metrics into a 0-100 score
+KEYWORD_DENSITY_RANGE = (0.5, 2.5)     # percent of words
+SENTENCE_LENGTH_MAX = 20               # average words per sentence
+PARAGRAPH_LENGTH_MAX = 150             # average words per paragraph
+READABILITY_TARGET = 60                # Flesch reading ease, "plain English"
+
+SCORE_WEIGHTS = {
+    "keyword": 0.30,
+    "headings": 0.20,
+    "readability": 0.20,
+    "sentences": 0.10,
+    "paragraphs": 0.10,
+    "links_lists": 0.10
+}
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word):
+    """Estimate syllables by counting vowel groups, ignoring silent 'e', 'es' and 'ed' endings"""
+    word = word.lower()
+    if word.isdigit():
+        return 1
+    count = len(_vowel_groups.findall(word))
+    if count > 1:
+        if word.endswith("e") and not word.endswith(("le", "ee", "ye")):
+            count -= 1
+        elif word.endswith(("es", "ed")) and not word.endswith(("ies", "ses", "ces", "zes", "ges", "ted", "ded", "ees", "eed")):
+            count -= 1
+    return max(count, 1)
+
+
+class _Vocabulary:
+    """Maps lowercase words to integer ids so keyword matching is an array comparison"""
+
+    def __init__(self):
+        self.ids = {}
+        self.syllables = []
+
+    def lookup(self, word):
+        word = word.lower()
+        word_id = self.ids.get(word)
+        if word_id is None:
+            word_id = self.ids[word] = len(self.syllables)
+            self.syllables.append(count_syllables(word))
+        return word_id
+
+
+def _tokenize(text, vocabulary, doc_id, out):
+    """Scan one document line by line, appending tokens and structure counts to `out`"""
+    sentence = out["sentence_count"]
+    paragraph = out["paragraph_count"]
+    heading_segment = out["heading_count"]
+    in_paragraph = False
+    h1 = h2 = h3 = lists = links = 0
+    first_h1 = []
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped == "---":
+            in_paragraph = False
+            continue
+
+        heading = _heading.match(stripped)
+        if heading:
+            level = len(heading.group(1))
+            heading_words = [vocabulary.lookup(word) for word in WORD_PATTERN.findall(heading.group(2))]
+            if level == 1:
+                if not h1:
+                    first_h1 = heading_words
+                h1 += 1
+            elif level == 2:
+                h2 += 1
+            else:
+                h3 += 1
+            # Headings count towards the keyword but not towards sentences or paragraphs
+            heading_segment += 1
+            for word_id in heading_words:
+                out["words"].append(word_id)
+                out["docs"].append(doc_id)
+                out["sentences"].append(-heading_segment)
+                out["paragraphs"].append(-1)
+            in_paragraph = False
+            continue
+
+        if _list_item.match(line):
+            lists += 1
+        links += len(_markdown_link.findall(stripped)) + len(_bare_link.findall(stripped))
+
+        if not in_paragraph:
+            paragraph += 1
+            in_paragraph = True
+
+        # Sentence boundaries inside the line; a line without terminal punctuation
+        # (list items, headings of sections) still closes a sentence.
+        position = 0
+        for match in _sentence_end.finditer(stripped):
+            chunk = WORD_PATTERN.findall(stripped[position:match.start()])
+            if chunk:
+                for word in chunk:
+                    out["words"].append(vocabulary.lookup(word))
+                    out["docs"].append(doc_id)
+                    out["sentences"].append(sentence)
+                    out["paragraphs"].append(paragraph - 1)
+                sentence += 1
+            position = match.end()
+        chunk = WORD_PATTERN.findall(stripped[position:])
+        if chunk:
+            for word in chunk:
+                out["words"].append(vocabulary.lookup(word))
+                out["docs"].append(doc_id)
+                out["sentences"].append(sentence)
+                out["paragraphs"].append(paragraph - 1)
+            sentence += 1
+
+    out["sentence_count"] = sentence
+    out["paragraph_count"] = paragraph
+    out["heading_count"] = heading_segment
+    out["structure"].append((h1, h2, h3, lists, links))
+    out["first_h1"].append(first_h1)
+
+
+def _keyword_table(documents, vocabulary):
+    """
+    Build a (documents, longest keyword) table of keyword word ids.
+
+    Row d holds the ids of document d's keyword; unused cells are -1 and
+    words missing from the vocabulary are -2, which no token can equal.
+    Returns the table and the keyword length of each document.
+    """
+    keywords = [WORD_PATTERN.findall(keyword.lower()) if keyword else [] for _, keyword in documents]
+    lengths = np.array([len(k) for k in keywords], dtype=np.int64)
+    table = np.full((len(documents), max(int(lengths.max()), 1)), -1, dtype=np.int64)
+    for doc_id, keyword in enumerate(keywords):
+        table[doc_id, :len(keyword)] = [vocabulary.ids.get(w, -2) for w in keyword]
+    return table, lengths
+
+
+def _keyword_matches(words, docs, segments, table, lengths):
+    """
+    Mark token positions where each document's own keyword phrase starts.
+
+    Position i matches when, for every j below the keyword length of
+    document docs[i], words[i + j] equals table[docs[i], j] and lies in the
+    same segment (sentence or heading). Segment ids are unique across the
+    batch, so this also keeps a phrase inside one document. All documents
+    are matched in one pass over the tokens.
+    """
+    total = len(words)
+    width = table.shape[1]
+    padded_words = np.concatenate([words, np.full(width, -3, dtype=np.int64)])
+    padded_segments = np.concatenate([segments, np.full(width, np.iinfo(np.int64).min, dtype=np.int64)])
+    token_lengths = lengths[docs]
+    matches = token_lengths > 0
+    for j in range(width):
+        active = token_lengths > j
+        same = (padded_words[j:j + total] == table[docs, j]) & (padded_segments[j:j + total] == segments)
+        matches &= ~active | same
+    return matches
+
+
+def _range_score(value, low, high):
+    """100 inside [low, high], falling off linearly to 0 at 0 and at 2 * high"""
+    below = np.clip(value / low, 0, 1) if low > 0 else np.ones_like(value)
+    above = np.clip(2 - value / high, 0, 1)
+    return 100 * np.where(value < low, below, np.where(value > high, above, 1.0))
+
+
+def analyze_batch(documents):
+    """
+    Analyze many documents at once.
+
+    `documents` is a list of (text, keyword) pairs; keyword may be None.
+    Returns one analysis dict per document, in the same order.
+    """
+    count = len(documents)
+    if count == 0:
+        return []
+
+    vocabulary = _Vocabulary()
+    out = {
+        "words": [], "docs": [], "sentences": [], "paragraphs": [], "structure": [], "first_h1": [],
+        "sentence_count": 0, "paragraph_count": 0, "heading_count": 0
+    }
+    for doc_id, (text, _) in enumerate(documents):
+        _tokenize(text or "", vocabulary, doc_id, out)
+
+    words = np.array(out["words"], dtype=np.int64)
+    docs = np.array(out["docs"], dtype=np.int64)
+    sentences = np.array(out["sentences"], dtype=np.int64)
+    paragraphs = np.array(out["paragraphs"], dtype=np.int64)
+    syllable_table = np.array(vocabulary.syllables or [0], dtype=np.int64)
+    syllables = syllable_table[words] if len(words) else np.zeros(0, dtype=np.int64)
+    structure = np.array(out["structure"], dtype=np.int64).reshape(count, 5)
+
+    # Body text excludes heading tokens (negative sentence ids)
+    body = sentences >= 0
+    word_count = np.bincount(docs, minlength=count)
+    body_words = np.bincount(docs[body], minlength=count)
+    body_syllables = np.bincount(docs[body], weights=syllables[body], minlength=count)
+
+    # Sentence and paragraph ids are global, so each maps to exactly one document
+    sentence_docs = np.full(out["sentence_count"], -1, dtype=np.int64)
+    sentence_docs[sentences[body]] = docs[body]
+    sentence_count = np.bincount(sentence_docs[sentence_docs >= 0], minlength=count)
+    paragraph_docs = np.full(out["paragraph_count"], -1, dtype=np.int64)
+    paragraph_docs[paragraphs[body]] = docs[body]
+    paragraph_count = np.bincount(paragraph_docs[paragraph_docs >= 0], minlength=count)
+    longest_sentence = np.zeros(count, dtype=np.int64)
+    if out["sentence_count"]:
+        sentence_lengths = np.bincount(sentences[body], minlength=out["sentence_count"])
+        valid = sentence_docs >= 0
+        np.maximum.at(longest_sentence, sentence_docs[valid], sentence_lengths[valid])
+
+    # Keyword occurrences: every document's keyword is matched in one pass over all tokens,
+    # then again over the first-H1 tokens to check whole-word placement in the title
+    table, keyword_lengths = _keyword_table(documents, vocabulary)
+    matches = _keyword_matches(words, docs, sentences, table, keyword_lengths)
+    keyword_count = np.bincount(docs[matches], minlength=count)
+    h1_words = np.array([w for title in out["first_h1"] for w in title], dtype=np.int64)
+    h1_docs = np.repeat(np.arange(count), [len(title) for title in out["first_h1"]])
+    h1_matches = _keyword_matches(h1_words, h1_docs, h1_docs, table, keyword_lengths)
+    keyword_in_h1 = np.bincount(h1_docs[h1_matches], minlength=count) > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe_words = np.maximum(word_count, 1)
+        safe_body = np.maximum(body_words, 1)
+        safe_sentences = np.maximum(sentence_count, 1)
+        keyword_words = np.maximum(keyword_lengths, 1)
+        keyword_density = 100.0 * keyword_count * keyword_words / safe_words
+        avg_sentence = body_words / safe_sentences
+        avg_paragraph = body_words / np.maximum(paragraph_count, 1)
+        flesch = 206.835 - 1.015 * avg_sentence - 84.6 * (body_syllables / safe_body)
+        flesch = np.where(body_words > 0, flesch, 0.0)
+
+    h1, h2, h3, lists, links = structure.T
+    has_keyword = np.array([bool(k and k.strip()) for _, k in documents])
+
+    keyword_score = np.where(
+        has_keyword,
+        _range_score(keyword_density, *KEYWORD_DENSITY_RANGE) * 0.8 + keyword_in_h1 * 20,
+        100.0
+    )
+    heading_score = 50 * (h1 == 1) + 30 * np.clip(h2 / 3, 0, 1) + 20 * np.clip(h3 / 2, 0, 1)
+    readability_score = np.clip(flesch / READABILITY_TARGET, 0, 1) * 100
+    sentence_score = _range_score(avg_sentence, 1, SENTENCE_LENGTH_MAX)
+    paragraph_score = _range_score(avg_paragraph, 1, PARAGRAPH_LENGTH_MAX)
+    links_lists_score = 50 * np.clip(lists / 3, 0, 1) + 50 * np.clip(links, 0, 1)
+
+    seo_score = (
+        SCORE_WEIGHTS["keyword"] * keyword_score
+        + SCORE_WEIGHTS["headings"] * heading_score
+        + SCORE_WEIGHTS["readability"] * readability_score
+        + SCORE_WEIGHTS["sentences"] * sentence_score
+        + SCORE_WEIGHTS["paragraphs"] * paragraph_score
+        + SCORE_WEIGHTS["links_lists"] * links_lists_score
+    )
+    seo_score = np.where(word_count > 0, np.rint(seo_score), 0).astype(int)
+
+    results = []
+    for i in range(count):
+        results.append({
+            "seo_score": int(seo_score[i]),
+            "word_count": int(word_count[i]),
+            "keyword": {
+                "keyword": documents[i][1] or None,
+                "occurrences": int(keyword_count[i]),
+                "density": round(float(keyword_density[i]), 2),
+                "in_h1": bool(keyword_in_h1[i])
+            },
+            "headings": {
+                "h1": int(h1[i]),
+                "h2": int(h2[i]),
+                "h3_plus": int(h3[i])
+            },
+            "readability": {
+                "flesch_reading_ease": round(float(flesch[i]), 1),
+                "sentence_count": int(sentence_count[i]),
+                "avg_sentence_length": round(float(avg_sentence[i]), 1),
+                "longest_sentence": int(longest_sentence[i]),
+                "paragraph_count": int(paragraph_count[i]),
+                "avg_paragraph_length": round(float(avg_paragraph[i]), 1)
+            },
+            "links": int(links[i]),
+            "list_items": int(lists[i]),
+            "scores": {
+                "keyword": int(round(keyword_score[i])),
+                "headings": int(round(heading_score[i])),
+                "readability": int(round(readability_score[i])),
+                "sentences": int(round(sentence_score[i])),
+                "paragraphs": int(round(paragraph_score[i])),
+                "links_lists": int(round(links_lists_score[i]))
+            }
+        })
+    return results
+
+
+def analyze_content(text, keyword=None):
+    """Analyze a single document"""
+    return analyze_batch([(text, keyword)])[0]